@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Armazém colunar das cartas para análises em Python.
+Grava volume, página, ano e assuntos (bitmask) como arrays NumPy e os textos
+como offsets + blob UTF-8, abertos com memory mapping e consultados sem
+reprocessar o cartas.json.
+
+Uso direto: gera o armazém a partir de data/cartas.json.
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Diretório base do projeto
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+ARMAZEM_DIR = DATA_DIR / "colunar"
+
+# Versão do formato em disco (meta.json)
+VERSAO_FORMATO = 1
+
+# Arquivo que aponta para a geração atual do armazém. Cada gravação cria uma
+# nova geração, troca este ponteiro com os.replace e preserva a geração que
+# era a atual; leitores mapeiam todos os arquivos da sua geração na abertura.
+PONTEIRO = "ATUAL"
+
+# Colunas numéricas e seus tipos. Ano ausente é gravado como 0.
+COLUNAS = {
+    "volume": np.uint16,
+    "pagina": np.uint16,
+    "ano": np.uint16,
+    "assuntos": np.uint64,
+}
+
+# Colunas de texto gravadas como offsets + blob
+COLUNAS_TEXTO = ["id", "texto"]
+
+# Colunas que aceitam agrupamento em contar_por()
+COLUNAS_AGRUPAVEIS = ["volume", "pagina", "ano"]
+
+
+def _escrever_textos(diretorio: Path, nome: str, valores: list):
+    """Grava uma coluna de texto como {nome}.bin (UTF-8) e {nome}_offsets.npy."""
+    codificados = [(v or "").encode('utf-8') for v in valores]
+    offsets = np.zeros(len(codificados) + 1, dtype=np.uint64)
+    np.cumsum([len(b) for b in codificados], out=offsets[1:])
+
+    with open(diretorio / f"{nome}.bin", 'wb') as f:
+        for b in codificados:
+            f.write(b)
+    np.save(diretorio / f"{nome}_offsets.npy", offsets)
+
+
+def _geracao_atual(diretorio: Path):
+    """Nome da geração apontada por ATUAL, ou None se ainda não houver."""
+    ponteiro = diretorio / PONTEIRO
+    if not ponteiro.exists():
+        return None
+    return ponteiro.read_text(encoding='utf-8').strip()
+
+
+def _timestamp_geracao(nome: str):
+    """Timestamp de uma geração (g<timestamp>-<pid>), ou None se não for uma."""
+    if not nome.startswith("g") or "-" not in nome:
+        return None
+    try:
+        return int(nome[1:].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def escrever_armazem(cartas: list, diretorio: Path = ARMAZEM_DIR) -> Path:
+    """
+    Grava o armazém colunar a partir da lista de cartas do índice.
+
+    As colunas são gravadas num diretório temporário, promovido a nova geração
+    só depois de completo; em seguida o ponteiro ATUAL é trocado atomicamente
+    e as gerações mais antigas que a anterior são removidas quando possível
+    (no Windows, uma geração ainda mapeada por um leitor fica para depois).
+
+    Args:
+        cartas: Lista de cartas no formato de data/cartas.json
+        diretorio: Diretório de destino do armazém
+
+    Returns:
+        Diretório onde o armazém foi gravado
+    """
+    diretorio.mkdir(parents=True, exist_ok=True)
+
+    # Vocabulário de assuntos na ordem de primeira ocorrência: bit i = assuntos[i]
+    assuntos = []
+    for carta in cartas:
+        for assunto in carta['assuntos']:
+            if assunto not in assuntos:
+                assuntos.append(assunto)
+    if len(assuntos) > 64:
+        raise ValueError(f"Máximo de 64 assuntos no bitmask, encontrados {len(assuntos)}")
+    bits = {assunto: 1 << i for i, assunto in enumerate(assuntos)}
+
+    colunas = {
+        "volume": [c['volume'] for c in cartas],
+        "pagina": [c['pagina'] for c in cartas],
+        "ano": [c['ano'] or 0 for c in cartas],
+        "assuntos": [sum(bits[a] for a in set(c['assuntos'])) for c in cartas],
+    }
+
+    tmp_dir = diretorio / f"tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+
+    try:
+        for nome, dtype in COLUNAS.items():
+            np.save(tmp_dir / f"{nome}.npy", np.array(colunas[nome], dtype=dtype))
+
+        for nome in COLUNAS_TEXTO:
+            _escrever_textos(tmp_dir, nome, [c[nome] for c in cartas])
+
+        with open(tmp_dir / "meta.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                "versao": VERSAO_FORMATO,
+                "total": len(cartas),
+                "assuntos": assuntos
+            }, f, ensure_ascii=False, indent=2)
+
+        # Promover a geração completa e trocar o ponteiro
+        anterior = _geracao_atual(diretorio)
+        geracao = f"g{time.time_ns()}-{os.getpid()}"
+        os.replace(tmp_dir, diretorio / geracao)
+        ponteiro_tmp = diretorio / f"{PONTEIRO}.tmp-{os.getpid()}"
+        ponteiro_tmp.write_text(geracao, encoding='utf-8')
+        os.replace(ponteiro_tmp, diretorio / PONTEIRO)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Remover só gerações mais antigas que a anterior: a anterior pode ter
+    # acabado de ser lida do ponteiro por um leitor que ainda vai mapeá-la, e
+    # gerações mais novas podem ser de outro gravador prestes a trocar o
+    # ponteiro. Leitores já abertos mantêm seus arquivos mapeados (no POSIX
+    # continuam válidos após a remoção; no Windows a remoção falha).
+    if anterior is not None:
+        limite = _timestamp_geracao(anterior)
+        for antiga in diretorio.iterdir():
+            ts = _timestamp_geracao(antiga.name) if antiga.is_dir() else None
+            if ts is not None and ts < limite:
+                shutil.rmtree(antiga, ignore_errors=True)
+
+    return diretorio
+
+
+class ArmazemCartas:
+    """
+    Armazém colunar aberto com memory mapping.
+
+    As colunas volume, pagina, ano e assuntos são arrays NumPy somente leitura;
+    consultas retornam arrays de índices que podem ser combinados e passados
+    para contar_por(), contar_assuntos(), texto() e id().
+
+    Na abertura, meta.json é lido e todas as colunas, offsets e blobs da
+    geração atual são mapeados e conferidos com o total de cartas; a partir
+    daí o leitor não depende mais dos arquivos no diretório.
+    """
+
+    def __init__(self, diretorio: Path = ARMAZEM_DIR):
+        diretorio = Path(diretorio)
+        geracao = _geracao_atual(diretorio)
+        if geracao is None:
+            raise FileNotFoundError(
+                f"Armazém não encontrado em {diretorio}. Execute armazem_cartas.py primeiro."
+            )
+        self.diretorio = diretorio / geracao
+
+        with open(self.diretorio / "meta.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['versao'] != VERSAO_FORMATO:
+            raise ValueError(
+                f"Versão do armazém {meta['versao']} incompatível (esperada {VERSAO_FORMATO})"
+            )
+
+        self.total = meta['total']
+        self.lista_assuntos = meta['assuntos']
+
+        self.volume = self._abrir_coluna("volume")
+        self.pagina = self._abrir_coluna("pagina")
+        self.ano = self._abrir_coluna("ano")
+        self.assuntos = self._abrir_coluna("assuntos")
+
+        self._textos = {nome: self._abrir_texto(nome) for nome in COLUNAS_TEXTO}
+
+    def _verificar_tamanho(self, arquivo: str, tamanho: int, esperado: int):
+        if tamanho != esperado:
+            raise ValueError(
+                f"Armazém inconsistente em {self.diretorio}: {arquivo} tem {tamanho} "
+                f"entradas, esperadas {esperado}. Gere o armazém novamente."
+            )
+
+    def _abrir_coluna(self, nome: str) -> np.ndarray:
+        coluna = np.load(self.diretorio / f"{nome}.npy", mmap_mode='r')
+        self._verificar_tamanho(f"{nome}.npy", len(coluna), self.total)
+        return coluna
+
+    def _abrir_texto(self, nome: str) -> tuple:
+        offsets = np.load(self.diretorio / f"{nome}_offsets.npy", mmap_mode='r')
+        self._verificar_tamanho(f"{nome}_offsets.npy", len(offsets), self.total + 1)
+
+        blob_path = self.diretorio / f"{nome}.bin"
+        tamanho_blob = blob_path.stat().st_size
+        self._verificar_tamanho(f"{nome}.bin (bytes)", tamanho_blob, int(offsets[-1]))
+        # np.memmap não aceita arquivos vazios
+        if tamanho_blob:
+            blob = np.memmap(blob_path, dtype=np.uint8, mode='r')
+        else:
+            blob = np.zeros(0, dtype=np.uint8)
+        return offsets, blob
+
+    def __len__(self):
+        return self.total
+
+    def _ler_texto(self, nome: str, indice: int) -> str:
+        offsets, blob = self._textos[nome]
+        inicio, fim = int(offsets[indice]), int(offsets[indice + 1])
+        return blob[inicio:fim].tobytes().decode('utf-8')
+
+    def texto(self, indice: int) -> str:
+        """Texto OCR da carta no índice informado."""
+        return self._ler_texto("texto", indice)
+
+    def id(self, indice: int) -> str:
+        """Identificador da carta no índice informado (ex.: vol1_p028_img1)."""
+        return self._ler_texto("id", indice)
+
+    def mascara_assuntos(self, assuntos: list) -> int:
+        """
+        Converte nomes de assuntos no bitmask correspondente.
+
+        Raises:
+            KeyError: Se algum assunto não existir no armazém
+        """
+        mascara = 0
+        for assunto in assuntos:
+            if assunto not in self.lista_assuntos:
+                raise KeyError(f"Assunto desconhecido: {assunto}")
+            mascara |= 1 << self.lista_assuntos.index(assunto)
+        return mascara
+
+    def filtrar(self, volume=None, ano_min=None, ano_max=None, assuntos=None,
+                todos_assuntos=False) -> np.ndarray:
+        """
+        Seleciona cartas pelos critérios informados (combinados com E).
+
+        Args:
+            volume: Número do volume ou lista de volumes
+            ano_min: Ano mínimo (exclui cartas sem ano)
+            ano_max: Ano máximo (exclui cartas sem ano)
+            assuntos: Lista de assuntos
+            todos_assuntos: Se True exige todos os assuntos; senão, qualquer um
+
+        Returns:
+            Array com os índices das cartas selecionadas
+        """
+        selecao = np.ones(self.total, dtype=bool)
+
+        if volume is not None:
+            selecao &= np.isin(self.volume, np.atleast_1d(volume))
+        if ano_min is not None or ano_max is not None:
+            ano = self.ano
+            selecao &= ano != 0
+            if ano_min is not None:
+                selecao &= ano >= ano_min
+            if ano_max is not None:
+                selecao &= ano <= ano_max
+        if assuntos:
+            mascara = np.uint64(self.mascara_assuntos(assuntos))
+            if todos_assuntos:
+                selecao &= (self.assuntos & mascara) == mascara
+            else:
+                selecao &= (self.assuntos & mascara) != 0
+
+        return np.flatnonzero(selecao)
+
+    def contar_por(self, campo: str, indices=None) -> dict:
+        """
+        Conta cartas agrupadas por volume, pagina ou ano.
+
+        Args:
+            campo: Nome da coluna de agrupamento
+            indices: Índices retornados por filtrar() (padrão: todas as cartas)
+
+        Returns:
+            Dicionário {valor: quantidade}; cartas sem ano são ignoradas
+        """
+        if campo not in COLUNAS_AGRUPAVEIS:
+            raise ValueError(f"Campo inválido: {campo} (use {', '.join(COLUNAS_AGRUPAVEIS)})")
+
+        valores = getattr(self, campo)
+        if indices is not None:
+            valores = valores[indices]
+
+        contagem = np.bincount(valores)
+        if campo == "ano" and len(contagem):
+            contagem[0] = 0
+        return {int(v): int(contagem[v]) for v in np.flatnonzero(contagem)}
+
+    def contar_assuntos(self, indices=None) -> dict:
+        """Conta cartas por assunto (uma carta conta em cada um de seus assuntos)."""
+        assuntos = self.assuntos if indices is None else self.assuntos[indices]
+        return {
+            assunto: int(np.count_nonzero(assuntos & np.uint64(1 << i)))
+            for i, assunto in enumerate(self.lista_assuntos)
+        }
+
+
+def main():
+    """Gera o armazém colunar a partir de data/cartas.json."""
+    print("="*60)
+    print("ARMAZÉM COLUNAR DE CARTAS")
+    print("="*60)
+
+    cartas_path = DATA_DIR / "cartas.json"
+    if not cartas_path.exists():
+        print("ERRO: Índice não encontrado. Execute processar_ocr.py primeiro.")
+        return
+
+    with open(cartas_path, 'r', encoding='utf-8') as f:
+        cartas = json.load(f)['cartas']
+
+    diretorio = escrever_armazem(cartas)
+    armazem = ArmazemCartas(diretorio)
+
+    print(f"Total de cartas: {len(armazem)}")
+    for volume, count in armazem.contar_por("volume").items():
+        print(f"  - Volume {volume}: {count}")
+    print(f"Cartas com ano identificado: {sum(armazem.contar_por('ano').values())}")
+    print(f"Armazém salvo em: {armazem.diretorio}")
+
+
+if __name__ == "__main__":
+    main()
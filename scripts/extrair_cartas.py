@@ -1,57 +1,57 @@
 #!/usr/bin/env python3
 """
 Script para extrair imagens das cartas dos PDFs do Silvano Corrêa.
-Extrai imagens válidas (>200x200 pixels) e salva em assets/cartas/vol1 e vol2.
+Extrai imagens válidas (>200x200 pixels) e salva no diretório de saída de cada
+volume registrado em scripts/volumes.json.
 """
 
 import fitz  # PyMuPDF
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from PIL import Image
 import io
+import sys
+
+from volumes import carregar_volumes, max_workers
 
 # Diretório base do projeto
 BASE_DIR = Path(__file__).parent.parent
 ASSETS_DIR = BASE_DIR / "assets" / "cartas"
 
-# PDFs a processar
-PDFS = {
-    1: BASE_DIR / "SILAVANO CORRÊA _LIVRO_01_ARQUIVO_FINAL.pdf",
-    2: BASE_DIR / "SILVANO CORRÊA _ VOLUME 2_ ARQUIVO FINAL.pdf"
-}
-
 # Tamanho mínimo para considerar uma imagem válida
 MIN_WIDTH = 200
 MIN_HEIGHT = 200
 
-def extrair_imagens_pdf(pdf_path: Path, volume: int, output_dir: Path):
+# Páginas por tarefa enviada ao pool de workers
+PAGINAS_POR_TAREFA = 20
+
+# No Windows, ProcessPoolExecutor aceita no máximo 61 workers
+MAX_WORKERS_WINDOWS = 61
+
+def extrair_imagens_paginas(pdf_path: Path, volume: int, output_dir: Path,
+                            pagina_inicio: int, pagina_fim: int):
     """
-    Extrai imagens de um PDF e salva no diretório especificado.
+    Extrai imagens de um intervalo de páginas de um PDF.
+
+    Executada em um processo do pool: cada tarefa abre seu próprio documento,
+    já que objetos do PyMuPDF não podem ser compartilhados entre processos.
 
     Args:
         pdf_path: Caminho do arquivo PDF
-        volume: Número do volume (1 ou 2)
+        volume: Número do volume
         output_dir: Diretório de saída para as imagens
-    """
-    print(f"\n{'='*60}")
-    print(f"Processando Volume {volume}: {pdf_path.name}")
-    print(f"{'='*60}")
-
-    if not pdf_path.exists():
-        print(f"ERRO: Arquivo não encontrado: {pdf_path}")
-        return []
-
-    # Criar diretório de saída
-    output_dir.mkdir(parents=True, exist_ok=True)
+        pagina_inicio: Índice da primeira página (base 0, inclusivo)
+        pagina_fim: Índice da última página (base 0, exclusivo)
 
+    Returns:
+        Tupla (imagens extraídas, total de imagens encontradas no intervalo)
+    """
     doc = fitz.open(pdf_path)
     imagens_extraidas = []
     total_imagens = 0
-    imagens_validas = 0
 
-    print(f"Total de páginas: {len(doc)}")
-
-    for page_num in range(len(doc)):
+    for page_num in range(pagina_inicio, pagina_fim):
         page = doc[page_num]
         page_display = page_num + 1  # Página começa em 1 para exibição
 
@@ -76,8 +76,6 @@ def extrair_imagens_pdf(pdf_path: Path, volume: int, output_dir: Path):
                 if width < MIN_WIDTH or height < MIN_HEIGHT:
                     continue
 
-                imagens_validas += 1
-
                 # Nome do arquivo: vol1_p028_img1.jpg
                 filename = f"vol{volume}_p{page_display:03d}_img{img_index}.jpg"
                 filepath = output_dir / filename
@@ -99,21 +97,50 @@ def extrair_imagens_pdf(pdf_path: Path, volume: int, output_dir: Path):
                     'altura': height
                 })
 
-                if imagens_validas % 50 == 0:
-                    print(f"  Processadas {imagens_validas} imagens válidas...")
-
             except Exception as e:
                 print(f"  Erro ao extrair imagem {img_index} da página {page_display}: {e}")
                 continue
 
     doc.close()
 
-    print(f"\nResultado Volume {volume}:")
-    print(f"  - Total de imagens encontradas: {total_imagens}")
-    print(f"  - Imagens válidas (>{MIN_WIDTH}x{MIN_HEIGHT}): {imagens_validas}")
-    print(f"  - Salvas em: {output_dir}")
+    return imagens_extraidas, total_imagens
 
-    return imagens_extraidas
+
+def planejar_tarefas(volumes: list) -> list:
+    """
+    Divide as páginas de todos os volumes em tarefas para o pool de workers.
+
+    Args:
+        volumes: Entradas do registro de volumes
+
+    Returns:
+        Lista de tuplas (volume, pdf_path, output_dir, pagina_inicio, pagina_fim)
+    """
+    tarefas = []
+
+    for vol in volumes:
+        volume, pdf_path, output_dir = vol['volume'], vol['pdf'], vol['saida']
+
+        print(f"\n{'='*60}")
+        print(f"Volume {volume}: {pdf_path.name}")
+        print(f"{'='*60}")
+
+        if not pdf_path.exists():
+            print(f"ERRO: Arquivo não encontrado: {pdf_path}")
+            continue
+
+        # Criar diretório de saída
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        with fitz.open(pdf_path) as doc:
+            total_paginas = len(doc)
+        print(f"Total de páginas: {total_paginas}")
+
+        for inicio in range(0, total_paginas, PAGINAS_POR_TAREFA):
+            fim = min(inicio + PAGINAS_POR_TAREFA, total_paginas)
+            tarefas.append((volume, pdf_path, output_dir, inicio, fim))
+
+    return tarefas
 
 
 def main():
@@ -122,19 +149,50 @@ def main():
     print("EXTRAÇÃO DE CARTAS - SILVANO CORRÊA")
     print("="*60)
 
-    todas_imagens = []
+    volumes = carregar_volumes()
+    workers = max_workers()
+    if sys.platform == 'win32':
+        workers = min(workers, MAX_WORKERS_WINDOWS)
+    tarefas = planejar_tarefas(volumes)
+
+    print(f"\nTarefas: {len(tarefas)} ({PAGINAS_POR_TAREFA} páginas cada), workers: {workers}")
+
+    # Resultados por tarefa, para montar o manifesto na ordem das páginas
+    resultados = {}
+    totais = {vol['volume']: 0 for vol in volumes}
+    validas = {vol['volume']: 0 for vol in volumes}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(extrair_imagens_paginas, pdf_path, volume, output_dir, inicio, fim):
+                (volume, inicio)
+            for volume, pdf_path, output_dir, inicio, fim in tarefas
+        }
+
+        for future in as_completed(futures):
+            volume, inicio = futures[future]
+            imagens, total_imagens = future.result()
+            resultados[(volume, inicio)] = imagens
+            totais[volume] += total_imagens
+
+            validas_antes = validas[volume]
+            validas[volume] += len(imagens)
+            if validas[volume] // 50 > validas_antes // 50:
+                print(f"  Volume {volume}: processadas {validas[volume]} imagens válidas...")
 
-    for volume, pdf_path in PDFS.items():
-        output_dir = ASSETS_DIR / f"vol{volume}"
-        imagens = extrair_imagens_pdf(pdf_path, volume, output_dir)
-        todas_imagens.extend(imagens)
+    todas_imagens = []
+    for chave in sorted(resultados):
+        todas_imagens.extend(resultados[chave])
 
     print("\n" + "="*60)
     print("RESUMO FINAL")
     print("="*60)
     print(f"Total de imagens extraídas: {len(todas_imagens)}")
-    print(f"  - Volume 1: {sum(1 for i in todas_imagens if i['volume'] == 1)}")
-    print(f"  - Volume 2: {sum(1 for i in todas_imagens if i['volume'] == 2)}")
+    for vol in volumes:
+        volume = vol['volume']
+        validas = sum(1 for i in todas_imagens if i['volume'] == volume)
+        print(f"  - Volume {volume}: {validas} válidas de {totais[volume]} encontradas"
+              f" (salvas em {vol['saida']})")
 
     # Salvar lista de imagens para uso posterior
     import json
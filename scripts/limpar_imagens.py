@@ -8,9 +8,10 @@ import os
 import hashlib
 from pathlib import Path
 
+from volumes import carregar_volumes
+
 # Diretório base
 BASE_DIR = Path(__file__).parent.parent
-CARTAS_DIR = BASE_DIR / "assets" / "cartas"
 
 # Tamanho mínimo em bytes (50KB)
 MIN_SIZE = 50 * 1024
@@ -69,15 +70,16 @@ def main():
     print("="*60)
     print(f"Tamanho mínimo: {MIN_SIZE/1024:.0f}KB")
 
-    total_vol1 = limpar_volume(CARTAS_DIR / "vol1", 1)
-    total_vol2 = limpar_volume(CARTAS_DIR / "vol2", 2)
+    totais = {}
+    for vol in carregar_volumes():
+        totais[vol['volume']] = limpar_volume(vol['saida'], vol['volume']) or 0
 
     print("\n" + "="*60)
     print("RESUMO FINAL")
     print("="*60)
-    print(f"Volume 1: {total_vol1} cartas")
-    print(f"Volume 2: {total_vol2} cartas")
-    print(f"Total: {total_vol1 + total_vol2} cartas")
+    for volume, total in totais.items():
+        print(f"Volume {volume}: {total} cartas")
+    print(f"Total: {sum(totais.values())} cartas")
 
 if __name__ == "__main__":
     main()
@@ -7,18 +7,29 @@ Usa Tesseract OCR com idioma português.
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import pytesseract
 
+from armazem_cartas import escrever_armazem
+from volumes import carregar_volumes, faixas_de_anos, max_workers
+
 # Configurar caminho do Tesseract no Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Uma thread OpenMP por processo do Tesseract: o paralelismo vem do pool de
+# workers, e sem este limite cada processo abriria várias threads por CPU
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
 # Diretório base do projeto
 BASE_DIR = Path(__file__).parent.parent
 ASSETS_DIR = BASE_DIR / "assets" / "cartas"
 DATA_DIR = BASE_DIR / "data"
 
+# Faixa de anos de cada volume, lida do registro de volumes
+FAIXAS_DE_ANOS = faixas_de_anos()
+
 # Palavras-chave por assunto para classificação automática
 ASSUNTOS_KEYWORDS = {
     "Brasil": [
@@ -107,16 +118,15 @@ def extrair_ano_do_texto(texto: str, volume: int) -> int:
 
     Args:
         texto: Texto extraído via OCR
-        volume: Número do volume (usado para estimar range de anos)
+        volume: Número do volume (range de anos vem de scripts/volumes.json)
 
     Returns:
         Ano encontrado ou None
     """
     # Range de anos por volume
-    if volume == 1:
-        ano_min, ano_max = 1958, 2008
-    else:
-        ano_min, ano_max = 2009, 2025
+    if volume not in FAIXAS_DE_ANOS:
+        return None
+    ano_min, ano_max = FAIXAS_DE_ANOS[volume]
 
     # Procurar padrões de data
     # dd/mm/yyyy ou dd-mm-yyyy ou dd.mm.yyyy
@@ -205,21 +215,22 @@ def processar_todas_imagens():
     with open(manifest_path, 'r', encoding='utf-8') as f:
         imagens = json.load(f)
 
-    print(f"Total de imagens a processar: {len(imagens)}")
-
-    cartas = []
-    processadas = 0
-
-    for img_info in imagens:
-        processadas += 1
-        imagem_path = BASE_DIR / img_info['imagem']
+    workers = max_workers()
+    print(f"Total de imagens a processar: {len(imagens)} (workers: {workers})")
 
-        if processadas % 50 == 0:
-            print(f"Processando imagem {processadas}/{len(imagens)}...")
+    # O Tesseract roda em subprocesso, então threads bastam para ocupar as
+    # CPUs; imagens de todos os volumes dividem o mesmo orçamento de workers.
+    caminhos = [BASE_DIR / img_info['imagem'] for img_info in imagens]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        textos = []
+        for processadas, texto in enumerate(executor.map(processar_imagem_ocr, caminhos), 1):
+            textos.append(texto)
+            if processadas % 50 == 0:
+                print(f"Processando imagem {processadas}/{len(imagens)}...")
 
-        # Processar OCR
-        texto = processar_imagem_ocr(imagem_path)
+    cartas = []
 
+    for img_info, texto in zip(imagens, textos):
         # Extrair metadados do texto
         volume = img_info['volume']
         ano = extrair_ano_do_texto(texto, volume)
@@ -248,12 +259,16 @@ def processar_todas_imagens():
     with open(cartas_path, 'w', encoding='utf-8') as f:
         json.dump({"cartas": cartas}, f, ensure_ascii=False, indent=2)
 
+    # Armazém colunar para análises em Python
+    armazem_dir = escrever_armazem(cartas)
+
     print("\n" + "="*60)
     print("RESUMO DO PROCESSAMENTO")
     print("="*60)
     print(f"Total de cartas processadas: {len(cartas)}")
-    print(f"  - Volume 1: {sum(1 for c in cartas if c['volume'] == 1)}")
-    print(f"  - Volume 2: {sum(1 for c in cartas if c['volume'] == 2)}")
+    for vol in carregar_volumes():
+        volume = vol['volume']
+        print(f"  - Volume {volume}: {sum(1 for c in cartas if c['volume'] == volume)}")
 
     # Estatísticas de assuntos
     assuntos_count = {}
@@ -273,6 +288,7 @@ def processar_todas_imagens():
 
     print(f"\nCartas com ano identificado: {sum(anos_count.values())}/{len(cartas)}")
     print(f"Índice salvo em: {cartas_path}")
+    print(f"Armazém colunar salvo em: {armazem_dir}")
 
     return cartas
 
@@ -7,18 +7,29 @@ Regenera o manifest.json e cartas.json apenas com imagens existentes.
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import pytesseract
 
+from armazem_cartas import escrever_armazem
+from volumes import carregar_volumes, faixas_de_anos, max_workers
+
 # Configurar caminho do Tesseract no Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Uma thread OpenMP por processo do Tesseract: o paralelismo vem do pool de
+# workers, e sem este limite cada processo abriria várias threads por CPU
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
 # Diretório base
 BASE_DIR = Path(__file__).parent.parent
 CARTAS_DIR = BASE_DIR / "assets" / "cartas"
 DATA_DIR = BASE_DIR / "data"
 
+# Faixa de anos de cada volume, lida do registro de volumes
+FAIXAS_DE_ANOS = faixas_de_anos()
+
 # Palavras-chave por assunto
 ASSUNTOS_KEYWORDS = {
     "Brasil": ["brasil", "brasileiro", "pátria", "nação", "nacional", "país"],
@@ -46,8 +57,9 @@ def classificar_assuntos(texto):
     return assuntos if assuntos else ["Geral"]
 
 def extrair_ano(texto, volume):
-    ano_min = 1958 if volume == 1 else 2009
-    ano_max = 2008 if volume == 1 else 2025
+    if volume not in FAIXAS_DE_ANOS:
+        return None
+    ano_min, ano_max = FAIXAS_DE_ANOS[volume]
 
     patterns = [
         r'\b(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{4})\b',
@@ -88,55 +100,63 @@ def reindexar():
     print("REINDEXAÇÃO DE CARTAS")
     print("="*60)
 
-    cartas = []
-    manifest = []
-
-    for volume in [1, 2]:
-        vol_dir = CARTAS_DIR / f"vol{volume}"
+    # Listar imagens de todos os volumes registrados
+    imagens = []
+    for vol in carregar_volumes():
+        volume, vol_dir = vol['volume'], vol['saida']
         if not vol_dir.exists():
             continue
 
-        imagens = sorted(vol_dir.glob("*.jpg"))
-        print(f"\nVolume {volume}: {len(imagens)} imagens")
-
-        for i, img_path in enumerate(imagens, 1):
+        imagens_vol = sorted(vol_dir.glob("*.jpg"))
+        print(f"\nVolume {volume}: {len(imagens_vol)} imagens")
+        imagens.extend((volume, img_path) for img_path in imagens_vol)
+
+    # OCR concorrente: todos os volumes dividem o mesmo orçamento de workers
+    workers = max_workers()
+    print(f"\nProcessando OCR de {len(imagens)} imagens (workers: {workers})")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        textos = []
+        caminhos = [img_path for _, img_path in imagens]
+        for i, texto in enumerate(executor.map(processar_ocr, caminhos), 1):
+            textos.append(texto)
             if i % 50 == 0:
                 print(f"  Processando {i}/{len(imagens)}...")
 
-            # Extrair info do nome do arquivo
-            nome = img_path.stem  # vol1_p028_img1
-            partes = nome.split('_')
-            pagina = int(partes[1][1:])  # p028 -> 28
-
-            # Processar OCR
-            texto = processar_ocr(img_path)
-
-            # Extrair metadados
-            ano = extrair_ano(texto, volume)
-            data_pub = extrair_data(texto)
-            assuntos = classificar_assuntos(texto)
-
-            # Caminho relativo
-            caminho_rel = str(img_path.relative_to(BASE_DIR)).replace("\\", "/")
-
-            carta = {
-                "id": nome,
-                "volume": volume,
-                "pagina": pagina,
-                "ano": ano,
-                "data_publicacao": data_pub,
-                "imagem": caminho_rel,
-                "texto": texto,
-                "assuntos": assuntos
-            }
-            cartas.append(carta)
-
-            manifest.append({
-                "id": nome,
-                "volume": volume,
-                "pagina": pagina,
-                "imagem": caminho_rel
-            })
+    cartas = []
+    manifest = []
+
+    for (volume, img_path), texto in zip(imagens, textos):
+        # Extrair info do nome do arquivo
+        nome = img_path.stem  # vol1_p028_img1
+        partes = nome.split('_')
+        pagina = int(partes[1][1:])  # p028 -> 28
+
+        # Extrair metadados
+        ano = extrair_ano(texto, volume)
+        data_pub = extrair_data(texto)
+        assuntos = classificar_assuntos(texto)
+
+        # Caminho relativo
+        caminho_rel = str(img_path.relative_to(BASE_DIR)).replace("\\", "/")
+
+        carta = {
+            "id": nome,
+            "volume": volume,
+            "pagina": pagina,
+            "ano": ano,
+            "data_publicacao": data_pub,
+            "imagem": caminho_rel,
+            "texto": texto,
+            "assuntos": assuntos
+        }
+        cartas.append(carta)
+
+        manifest.append({
+            "id": nome,
+            "volume": volume,
+            "pagina": pagina,
+            "imagem": caminho_rel
+        })
 
     # Salvar arquivos
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -147,6 +167,10 @@ def reindexar():
         json.dump({"cartas": cartas}, f, ensure_ascii=False, indent=2)
     print(f"\nSalvo: {cartas_path}")
 
+    # Armazém colunar para análises em Python
+    armazem_dir = escrever_armazem(cartas)
+    print(f"Salvo: {armazem_dir}")
+
     # manifest.json
     manifest_path = CARTAS_DIR / "manifest.json"
     with open(manifest_path, 'w', encoding='utf-8') as f:
@@ -157,13 +181,12 @@ def reindexar():
     print("\n" + "="*60)
     print("RESUMO")
     print("="*60)
-    vol1_count = sum(1 for c in cartas if c['volume'] == 1)
-    vol2_count = sum(1 for c in cartas if c['volume'] == 2)
     com_ano = sum(1 for c in cartas if c['ano'])
 
     print(f"Total de cartas: {len(cartas)}")
-    print(f"  - Volume 1: {vol1_count}")
-    print(f"  - Volume 2: {vol2_count}")
+    for vol in carregar_volumes():
+        volume = vol['volume']
+        print(f"  - Volume {volume}: {sum(1 for c in cartas if c['volume'] == volume)}")
     print(f"Cartas com ano identificado: {com_ano}")
 
     # Contagem de assuntos
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Registro de volumes compartilhado pelos scripts.
+Lê scripts/volumes.json (PDF, faixa de anos e diretório de saída de cada volume)
+e o orçamento global de workers usado no processamento concorrente.
+"""
+
+import json
+import os
+from pathlib import Path
+
+# Diretório base do projeto
+BASE_DIR = Path(__file__).parent.parent
+
+# Arquivo de registro dos volumes
+REGISTRO_PATH = Path(__file__).parent / "volumes.json"
+
+
+def _caminho_no_projeto(entrada: dict, campo: str) -> Path:
+    """
+    Resolve um caminho do registro a partir do diretório base.
+
+    Raises:
+        ValueError: Se o caminho for absoluto ou apontar para fora do projeto
+    """
+    relativo = Path(entrada[campo])
+    caminho = (BASE_DIR / relativo).resolve()
+    if relativo.is_absolute() or not caminho.is_relative_to(BASE_DIR.resolve()):
+        raise ValueError(
+            f"Volume {entrada['volume']}: '{campo}' deve ser um caminho relativo "
+            f"dentro do projeto, recebido '{entrada[campo]}'"
+        )
+    return BASE_DIR / relativo
+
+
+def carregar_registro(registro_path: Path = REGISTRO_PATH) -> dict:
+    """
+    Carrega o registro de volumes.
+
+    Args:
+        registro_path: Caminho do arquivo JSON de registro
+
+    Returns:
+        Dicionário com 'max_workers' e a lista 'volumes', com os caminhos
+        'pdf' e 'saida' já resolvidos a partir do diretório base
+    """
+    with open(registro_path, 'r', encoding='utf-8') as f:
+        registro = json.load(f)
+
+    volumes = []
+    for entrada in registro['volumes']:
+        ano_min, ano_max = int(entrada['ano_min']), int(entrada['ano_max'])
+        if ano_min > ano_max:
+            raise ValueError(
+                f"Volume {entrada['volume']}: ano_min ({ano_min}) maior que ano_max ({ano_max})"
+            )
+        volumes.append({
+            'volume': int(entrada['volume']),
+            'pdf': _caminho_no_projeto(entrada, 'pdf'),
+            'ano_min': ano_min,
+            'ano_max': ano_max,
+            'saida': _caminho_no_projeto(entrada, 'saida')
+        })
+
+    numeros = [v['volume'] for v in volumes]
+    if len(numeros) != len(set(numeros)):
+        raise ValueError(f"Números de volume duplicados em {registro_path}")
+
+    return {
+        'max_workers': registro.get('max_workers'),
+        'volumes': sorted(volumes, key=lambda v: v['volume'])
+    }
+
+
+def carregar_volumes() -> list:
+    """Retorna a lista de volumes do registro, ordenada pelo número do volume."""
+    return carregar_registro()['volumes']
+
+
+def faixas_de_anos() -> dict:
+    """Retorna {volume: (ano_min, ano_max)} para todos os volumes registrados."""
+    return {v['volume']: (v['ano_min'], v['ano_max']) for v in carregar_volumes()}
+
+
+def max_workers() -> int:
+    """
+    Orçamento global de workers para o processamento concorrente.
+
+    A variável de ambiente CARTAS_WORKERS tem prioridade sobre 'max_workers'
+    do registro; se nenhum estiver definido, usa o número de CPUs.
+    """
+    valor = os.environ.get('CARTAS_WORKERS') or carregar_registro()['max_workers']
+    if valor:
+        return max(1, int(valor))
+    return os.cpu_count() or 1